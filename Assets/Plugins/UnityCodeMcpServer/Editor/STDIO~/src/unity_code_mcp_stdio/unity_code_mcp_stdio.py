@@ -4,16 +4,21 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+import concurrent.futures
+import io
 import itertools
 import json
 import logging
 from logging.handlers import RotatingFileHandler
 import os
+import re
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 import sys
-from typing import Any, Protocol
+import threading
+import time
+from typing import Any, BinaryIO, Callable, Coroutine, Protocol
 from uuid import uuid4
 
 import anyio
@@ -24,8 +29,56 @@ from mcp.shared.message import SessionMessage
 from mcp.types import JSONRPCMessage
 from pydantic import AnyUrl
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is a declared dependency
+    orjson = None
+
+# orjson only handles 64-bit integers. It refuses to encode larger ones and
+# decodes them as floats, so payloads carrying such integers use stdlib json.
+_LONG_DIGIT_RUN = re.compile(rb"\d{19}")
+
+
+def _stdlib_json_dumps(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _stdlib_json_loads(data: bytes | bytearray | memoryview) -> Any:
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+if orjson is None:  # pragma: no cover
+    _json_dumps = _stdlib_json_dumps
+    _json_loads = _stdlib_json_loads
+else:
+
+    def _json_dumps(value: Any) -> bytes:
+        try:
+            return orjson.dumps(value)
+        except TypeError:
+            return _stdlib_json_dumps(value)
+
+    def _json_loads(data: bytes | bytearray | memoryview) -> Any:
+        if _LONG_DIGIT_RUN.search(data):
+            return _stdlib_json_loads(data)
+        return orjson.loads(data)
+
+
+def _silence_stderr() -> None:
+    """Point fd 2 at the null device so stray stderr output is dropped by the OS."""
+    devnull_fd = os.open(os.devnull, os.O_WRONLY)
+    try:
+        os.dup2(devnull_fd, 2)
+    except OSError:
+        sys.stderr = open(os.devnull, "w")
+    finally:
+        os.close(devnull_fd)
+
+
 # Keep stderr silent so JSON-RPC stdio output is never corrupted.
-sys.stderr = open(os.devnull, "w")
+_silence_stderr()
 
 script_dir = os.path.dirname(os.path.abspath(__file__))
 log_file_path = os.path.join(script_dir, "unity-code-mcp-stdio.log")
@@ -37,23 +90,110 @@ logger.propagate = False
 LOG_MAX_BYTES = 5 * 1024 * 1024
 LOG_BACKUP_COUNT = 3
 LOG_VALUE_PREVIEW_LIMIT = 160
+LOG_FLUSH_RECORD_COUNT = 32
+LOG_FLUSH_INTERVAL_SECONDS = 0.25
 REQUEST_UNAVAILABLE_ERROR_CODE = -32000
 DEFAULT_FILE_REQUEST_TIMEOUT = 180.0
 RESPONSE_POLL_INTERVAL_SECONDS = 0.1
+RESPONSE_POLL_INITIAL_INTERVAL_SECONDS = 0.005
+STDIO_FRAME_DELIMITER = b"\n"
+STDIN_READ_CHUNK_SIZE = 64 * 1024
+STDIN_LINE_QUEUE_SIZE = 100
+STDOUT_BUFFER_SIZE = 64 * 1024
+RESPONSE_READ_BUFFER_SIZE = 64 * 1024
+RESPONSE_PARSE_OFFLOAD_BYTES = 64 * 1024
+LIST_RESULT_CACHE_TTL_SECONDS = 5.0
 
 formatter = logging.Formatter(
     "%(asctime)s - pid=%(process)d - %(levelname)s - %(message)s"
 )
 
 _REQUEST_TRACE_SEQUENCE = itertools.count(1)
+_last_request_time: datetime | None = None
 
 
 class FlushingHandler(RotatingFileHandler):
-    """File handler that flushes immediately after each log message."""
+    """File handler that flushes on warnings and otherwise in small batches."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        self._deferring_flush = False
+        self._unflushed_records = 0
+        self._last_flush = time.monotonic()
+        self._flush_timer: threading.Timer | None = None
+        self._stream_size: int | None = None
+        super().__init__(*args, **kwargs)
+
+    def shouldRollover(self, record):
+        # Track the file size locally; the base implementation stats the path
+        # and calls tell(), which flushes the stream for every record. flush()
+        # drops the local size so writes from other bridge processes sharing
+        # the log file are picked up again.
+        record_size = len(self.format(record)) + len(self.terminator)
+        if self._stream_size is None:
+            try:
+                self._stream_size = os.path.getsize(self.baseFilename)
+            except OSError:
+                self._stream_size = 0
+
+        rollover = (
+            self.maxBytes > 0
+            and self._stream_size > 0
+            and self._stream_size + record_size >= self.maxBytes
+        )
+        self._stream_size = (0 if rollover else self._stream_size) + record_size
+        return rollover
 
     def emit(self, record):
-        super().emit(record)
-        self.flush()
+        self._deferring_flush = True
+        try:
+            super().emit(record)
+        finally:
+            self._deferring_flush = False
+
+        self._unflushed_records += 1
+        if (
+            record.levelno >= logging.WARNING
+            or self._unflushed_records >= LOG_FLUSH_RECORD_COUNT
+            or time.monotonic() - self._last_flush >= LOG_FLUSH_INTERVAL_SECONDS
+        ):
+            self.flush()
+        else:
+            self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        """Flush buffered records once the interval passes, even if logging stops."""
+        if self._flush_timer is not None:
+            return
+        delay = self._last_flush + LOG_FLUSH_INTERVAL_SECONDS - time.monotonic()
+        self._flush_timer = threading.Timer(max(delay, 0.0), self._flush_on_timer)
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+
+    def _flush_on_timer(self) -> None:
+        with self.lock:
+            self._flush_timer = None
+            if not self._unflushed_records or self.stream is None:
+                return
+            if time.monotonic() - self._last_flush >= LOG_FLUSH_INTERVAL_SECONDS:
+                self.flush()
+            else:
+                self._schedule_flush()
+
+    def flush(self):
+        # StreamHandler.emit flushes after every record; emit() decides instead.
+        if self._deferring_flush:
+            return
+        super().flush()
+        self._unflushed_records = 0
+        self._last_flush = time.monotonic()
+        self._stream_size = None
+
+    def close(self):
+        with self.lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+        super().close()
 
 
 def _truncate_for_log(value: Any, limit: int = LOG_VALUE_PREVIEW_LIMIT) -> str:
@@ -142,10 +282,10 @@ def _next_request_trace_id() -> str:
 _configure_logger()
 
 
-def _write_text_atomically(path: Path, content: str) -> None:
-    """Publish a text file only after its full contents are written."""
+def _write_bytes_atomically(path: Path, content: bytes) -> None:
+    """Publish a file only after its full contents are written."""
     temporary_path = path.with_name(f".{path.name}.{uuid4().hex}.tmp")
-    temporary_path.write_text(content, encoding="utf-8")
+    temporary_path.write_bytes(content)
     os.replace(temporary_path, path)
 
 
@@ -154,8 +294,18 @@ def get_project_root() -> Path:
     return Path(__file__).resolve().parents[7]
 
 
-def _timestamp_now() -> str:
-    return datetime.now().strftime("%Y%m%d%H%M%S%f")[:-3]
+def _next_request_timestamp() -> str:
+    """Return a yyyyMMddHHmmssfff timestamp that is unique within this process.
+
+    Requests created in the same millisecond are bumped to the next unused one.
+    """
+    global _last_request_time
+    now = datetime.now()
+    now = now.replace(microsecond=now.microsecond - now.microsecond % 1000)
+    if _last_request_time is not None and now <= _last_request_time:
+        now = _last_request_time + timedelta(milliseconds=1)
+    _last_request_time = now
+    return now.strftime("%Y%m%d%H%M%S%f")[:-3]
 
 
 @dataclass(frozen=True)
@@ -184,13 +334,15 @@ class FileBridgePaths:
 class UnityBridgeClient(Protocol):
     """Minimal client interface shared by the bridge transport."""
 
-    async def send_request(self, request_payload: dict[str, Any]) -> dict[str, Any]: ...
+    async def send_request(
+        self, request_payload: dict[str, Any], request_bytes: bytes | None = None
+    ) -> dict[str, Any]: ...
 
     async def disconnect(self, reason: str = "manual") -> None: ...
 
 
 class UnityFileClient(UnityBridgeClient):
-    """Single-flight file transport client for Unity MCP requests."""
+    """File transport client that keeps multiple Unity MCP requests in flight."""
 
     def __init__(
         self,
@@ -205,7 +357,15 @@ class UnityFileClient(UnityBridgeClient):
         )
         self.request_timeout = request_timeout
         self.response_poll_interval = response_poll_interval
-        self._lock = asyncio.Lock()
+        self._pending_responses: dict[Path, asyncio.Future[None]] = {}
+        self._response_poller: asyncio.Task[None] | None = None
+        self._response_poll_wakeup = asyncio.Event()
+        self._request_outbox: asyncio.Queue[
+            tuple[Path, bytes, asyncio.Future[None]]
+        ] = asyncio.Queue()
+        self._request_writer: asyncio.Task[None] | None = None
+        self._last_request: asyncio.Event | None = None
+        self._response_buffer = bytearray(RESPONSE_READ_BUFFER_SIZE)
 
     @staticmethod
     def _build_error(
@@ -219,98 +379,300 @@ class UnityFileClient(UnityBridgeClient):
 
     async def disconnect(self, reason: str = "manual") -> None:
         logger.info("File bridge reset reason=%s", reason)
+        for task in (self._request_writer, self._response_poller):
+            if task is not None and not task.done():
+                task.cancel()
+        self._request_writer = None
+        self._response_poller = None
+        while not self._request_outbox.empty():
+            self._request_outbox.get_nowait()[2].cancel()
+        for future in self._pending_responses.values():
+            future.cancel()
+
+    def _publish_requests(
+        self, batch: list[tuple[Path, bytes]]
+    ) -> list[Exception | None]:
+        """Write a batch of request files, reporting a failure per request."""
+        self.paths.ensure_messages_dir()
+        errors: list[Exception | None] = []
+        for request_path, request_bytes in batch:
+            try:
+                _write_bytes_atomically(request_path, request_bytes)
+            except Exception as exc:
+                errors.append(exc)
+            else:
+                errors.append(None)
+        return errors
+
+    async def _write_requests(self) -> None:
+        """Drain queued requests and publish each batch in one worker-thread hop."""
+        while not self._request_outbox.empty():
+            batch = []
+            while True:
+                try:
+                    batch.append(self._request_outbox.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
 
-    async def _wait_for_response(self, response_path: Path) -> None:
-        with anyio.fail_after(self.request_timeout):
-            while not response_path.exists():
-                logger.debug(
-                    "Waiting for Unity file response response=%s",
-                    response_path.name,
+            try:
+                errors = await asyncio.to_thread(
+                    self._publish_requests,
+                    [(path, payload) for path, payload, _ in batch],
                 )
-                await anyio.sleep(self.response_poll_interval)
+            except Exception as exc:
+                errors = [exc] * len(batch)
+
+            logger.debug("Published Unity request files count=%s", len(batch))
+            for (_, _, written), error in zip(batch, errors):
+                if written.done():
+                    continue
+                if error is None:
+                    written.set_result(None)
+                else:
+                    written.set_exception(error)
+
+        self._request_writer = None
+
+    def _ensure_request_writer(self) -> None:
+        if self._request_writer is None or self._request_writer.done():
+            self._request_writer = asyncio.create_task(self._write_requests())
+
+    def _read_response(self, response_path: Path) -> bytes | memoryview:
+        """Read a response file, reusing the client buffer when it fits."""
+        with open(response_path, "rb", buffering=0) as response_file:
+            size = os.fstat(response_file.fileno()).st_size
+            if size > len(self._response_buffer):
+                return response_file.readall()
+
+            view = memoryview(self._response_buffer)
+            filled = 0
+            while filled < size:
+                read_count = response_file.readinto(view[filled:size])
+                if not read_count:
+                    break
+                filled += read_count
+            return view[:filled]
+
+    async def _load_response(self, response_path: Path) -> dict[str, Any]:
+        """Parse a response file, moving large payloads off the event loop."""
+        data = self._read_response(response_path)
+        if len(data) <= RESPONSE_PARSE_OFFLOAD_BYTES:
+            return _json_loads(data)
+
+        if isinstance(data, memoryview):
+            # Other responses may reuse the client buffer while the thread parses.
+            data = data.tobytes()
+        return await asyncio.to_thread(_json_loads, data)
+
+    def _list_ready_responses(self) -> set[str]:
+        """Return the names of response files already published for this client."""
+        suffix = f"_response_{self.paths.client_id}.json"
+        try:
+            with os.scandir(self.paths.messages_dir) as entries:
+                return {entry.name for entry in entries if entry.name.endswith(suffix)}
+        except OSError:
+            return set()
+
+    async def _poll_responses(self) -> None:
+        """Resolve pending requests as Unity publishes their response files.
+
+        Polling starts fast after each new request and backs off to
+        response_poll_interval, so quick Unity replies are not held back by a
+        full poll interval.
+        """
+        initial_delay = min(
+            RESPONSE_POLL_INITIAL_INTERVAL_SECONDS, self.response_poll_interval
+        )
+        delay = initial_delay
+        while self._pending_responses:
+            ready = self._list_ready_responses()
+            for response_path, future in list(self._pending_responses.items()):
+                if response_path.name in ready and not future.done():
+                    future.set_result(None)
+
+            logger.debug(
+                "Waiting for Unity file responses pending=%s delay=%s",
+                len(self._pending_responses),
+                delay,
+            )
+            self._response_poll_wakeup.clear()
+            try:
+                await asyncio.wait_for(self._response_poll_wakeup.wait(), delay)
+                delay = initial_delay
+            except asyncio.TimeoutError:
+                delay = min(delay * 2, self.response_poll_interval)
+
+        self._response_poller = None
+
+    def _ensure_response_poller(self) -> None:
+        if self._response_poller is None or self._response_poller.done():
+            self._response_poller = asyncio.create_task(self._poll_responses())
 
-    async def send_request(self, request_payload: dict[str, Any]) -> dict[str, Any]:
+    async def _wait_for_response(self, response_path: Path) -> None:
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._pending_responses[response_path] = future
+        self._response_poll_wakeup.set()
+        self._ensure_response_poller()
+        try:
+            with anyio.fail_after(self.request_timeout):
+                await future
+        finally:
+            self._pending_responses.pop(response_path, None)
+
+    async def send_request(
+        self, request_payload: dict[str, Any], request_bytes: bytes | None = None
+    ) -> dict[str, Any]:
+        """Send a request to Unity and wait for its response.
+
+        request_bytes may carry request_payload already encoded as JSON, which
+        is written as-is instead of serializing the payload again.
+
+        Request files are published as soon as they are queued, but Unity
+        processes them one at a time. Each request's timeout therefore starts
+        only once every earlier request of this client has finished.
+        """
+        previous_request = self._last_request
+        request_done = asyncio.Event()
+        self._last_request = request_done
+        try:
+            return await self._exchange_request(
+                request_payload, request_bytes, previous_request
+            )
+        finally:
+            request_done.set()
+
+    async def _exchange_request(
+        self,
+        request_payload: dict[str, Any],
+        request_bytes: bytes | None,
+        previous_request: asyncio.Event | None,
+    ) -> dict[str, Any]:
         trace_id = _next_request_trace_id()
         request_summary = _describe_request(request_payload)
 
-        async with self._lock:
-            self.paths.ensure_messages_dir()
-            timestamp = _timestamp_now()
-            request_path = self.paths.build_request_path(timestamp)
-            response_path = self.paths.build_response_path(timestamp)
+        timestamp = _next_request_timestamp()
+        request_path = self.paths.build_request_path(timestamp)
+        response_path = self.paths.build_response_path(timestamp)
 
-            logger.info(
-                "trace=%s Unity file request started %s request=%s response=%s",
+        logger.info(
+            "trace=%s Unity file request started %s request=%s response=%s",
+            trace_id,
+            request_summary,
+            request_path.name,
+            response_path.name,
+        )
+
+        if request_bytes is None:
+            request_bytes = _json_dumps(request_payload)
+        written: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._request_outbox.put_nowait((request_path, request_bytes, written))
+        self._ensure_request_writer()
+        await written
+        logger.debug(
+            "trace=%s Unity file request written request=%s bytes=%s",
+            trace_id,
+            request_path.name,
+            len(request_bytes),
+        )
+
+        if previous_request is not None:
+            await previous_request.wait()
+
+        try:
+            await self._wait_for_response(response_path)
+            logger.debug(
+                "trace=%s Unity file response detected response=%s",
                 trace_id,
-                request_summary,
-                request_path.name,
                 response_path.name,
             )
-
-            _write_text_atomically(request_path, json.dumps(request_payload))
-            logger.debug(
-                "trace=%s Unity file request written request=%s bytes=%s",
+            response = await self._load_response(response_path)
+        except TimeoutError:
+            request_path.unlink(missing_ok=True)
+            logger.warning(
+                "trace=%s Unity file request timed out %s request=%s",
                 trace_id,
+                request_summary,
                 request_path.name,
-                request_path.stat().st_size,
             )
-
-            try:
-                await self._wait_for_response(response_path)
-                logger.debug(
-                    "trace=%s Unity file response detected response=%s",
-                    trace_id,
-                    response_path.name,
-                )
-                response = json.loads(response_path.read_text(encoding="utf-8"))
-            except TimeoutError:
-                request_path.unlink(missing_ok=True)
-                logger.warning(
-                    "trace=%s Unity file request timed out %s request=%s",
-                    trace_id,
-                    request_summary,
-                    request_path.name,
-                )
-                return self._build_error(
-                    request_payload,
-                    REQUEST_UNAVAILABLE_ERROR_CODE,
-                    f"Timed out waiting for Unity file response after {self.request_timeout} seconds",
-                )
-            except json.JSONDecodeError as exc:
-                logger.error(
-                    "trace=%s Unity file response json decode failed %s response=%s error=%s",
-                    trace_id,
-                    request_summary,
-                    response_path.name,
-                    exc,
-                )
-                return self._build_error(
-                    request_payload,
-                    -32603,
-                    f"Invalid Unity file response JSON: {exc}",
-                )
-            except Exception as exc:
-                logger.error(
-                    "trace=%s Unity file request failed unexpectedly %s",
-                    trace_id,
-                    request_summary,
-                    exc_info=True,
-                )
-                return self._build_error(
-                    request_payload,
-                    -32603,
-                    f"Internal error: {exc}",
-                )
-
-            request_path.unlink(missing_ok=True)
-            response_path.unlink(missing_ok=True)
-            logger.info(
-                "trace=%s Unity file request completed %s response=%s",
+            return self._build_error(
+                request_payload,
+                REQUEST_UNAVAILABLE_ERROR_CODE,
+                f"Timed out waiting for Unity file response after {self.request_timeout} seconds",
+            )
+        except json.JSONDecodeError as exc:
+            logger.error(
+                "trace=%s Unity file response json decode failed %s response=%s error=%s",
+                trace_id,
+                request_summary,
+                response_path.name,
+                exc,
+            )
+            return self._build_error(
+                request_payload,
+                -32603,
+                f"Invalid Unity file response JSON: {exc}",
+            )
+        except Exception as exc:
+            logger.error(
+                "trace=%s Unity file request failed unexpectedly %s",
                 trace_id,
                 request_summary,
-                _describe_response(response),
+                exc_info=True,
             )
-            return response
+            return self._build_error(
+                request_payload,
+                -32603,
+                f"Internal error: {exc}",
+            )
+
+        request_path.unlink(missing_ok=True)
+        response_path.unlink(missing_ok=True)
+        logger.info(
+            "trace=%s Unity file request completed %s response=%s",
+            trace_id,
+            request_summary,
+            _describe_response(response),
+        )
+        return response
+
+
+class _ListResultCache:
+    """Short-lived cache holding the last parsed result of each MCP list method."""
+
+    def __init__(self, ttl_seconds: float = LIST_RESULT_CACHE_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._slots: dict[str, tuple[float, list[Any]]] = {}
+
+    def get(self, method: str) -> list[Any] | None:
+        slot = self._slots.get(method)
+        if slot is None:
+            return None
+
+        stored_at, value = slot
+        if time.monotonic() - stored_at > self.ttl_seconds:
+            del self._slots[method]
+            return None
+
+        return list(value)
+
+    def put(self, method: str, value: list[Any]) -> None:
+        self._slots[method] = (time.monotonic(), list(value))
+
+    def clear(self) -> None:
+        self._slots.clear()
+
+
+def _build_list_request(request_id: str, method: str) -> dict[str, Any]:
+    return {"jsonrpc": "2.0", "id": request_id, "method": method, "params": {}}
+
+
+# The list requests never vary, so encode them once.
+_LIST_TOOLS_REQUEST = _build_list_request("list_tools", "tools/list")
+_LIST_TOOLS_REQUEST_BYTES = _json_dumps(_LIST_TOOLS_REQUEST)
+_LIST_PROMPTS_REQUEST = _build_list_request("list_prompts", "prompts/list")
+_LIST_PROMPTS_REQUEST_BYTES = _json_dumps(_LIST_PROMPTS_REQUEST)
+_LIST_RESOURCES_REQUEST = _build_list_request("list_resources", "resources/list")
+_LIST_RESOURCES_REQUEST_BYTES = _json_dumps(_LIST_RESOURCES_REQUEST)
 
 
 def _convert_resource_contents(
@@ -393,35 +755,106 @@ async def _build_call_tool_result(
     )
 
 
+def _encode_jsonrpc_message(message: JSONRPCMessage) -> bytes:
+    """Serialize an outbound JSON-RPC message to compact UTF-8 JSON."""
+    return _json_dumps(
+        message.model_dump(mode="json", by_alias=True, exclude_none=True)
+    )
+
+
+def _open_stdout_writer() -> BinaryIO:
+    """Return a stdout writer whose buffer is sized for whole message batches."""
+    try:
+        stdout_fd = sys.stdout.fileno()
+    except (AttributeError, OSError, ValueError):
+        return sys.stdout.buffer
+
+    sys.stdout.flush()
+    # A dedicated FileIO that leaves the descriptor open lets one preallocated
+    # buffer be reused for every batch instead of the default 8 KiB one.
+    return io.BufferedWriter(
+        io.FileIO(stdout_fd, "wb", closefd=False),
+        buffer_size=STDOUT_BUFFER_SIZE,
+    )
+
+
+def _pump_stdin_lines(
+    stream: BinaryIO,
+    deliver: Callable[[bytes | None], None],
+    chunk_size: int = STDIN_READ_CHUNK_SIZE,
+) -> None:
+    """Read stdin in bulk and deliver each complete line, then None at EOF."""
+    chunk = memoryview(bytearray(chunk_size))
+    pending = bytearray()
+    try:
+        while read_count := stream.readinto1(chunk):
+            pending += chunk[:read_count]
+            start = 0
+            while (end := pending.find(b"\n", start)) != -1:
+                deliver(bytes(pending[start:end]))
+                start = end + 1
+            del pending[:start]
+
+        if pending:
+            deliver(bytes(pending))
+    except RuntimeError:
+        # The event loop closed while stdin was still open; nobody is listening.
+        return
+    except Exception:
+        logger.error("stdin pump failed", exc_info=True)
+
+    try:
+        deliver(None)
+    except RuntimeError:
+        pass
+
+
+def _deliver_to_queue(
+    loop: asyncio.AbstractEventLoop, queue: asyncio.Queue[bytes | None]
+) -> Callable[[bytes | None], None]:
+    """Return a deliver callback that blocks the calling thread while queue is full."""
+
+    def deliver(line: bytes | None) -> None:
+        try:
+            asyncio.run_coroutine_threadsafe(queue.put(line), loop).result()
+        except concurrent.futures.CancelledError as exc:
+            # The loop cancelled the put while shutting down.
+            raise RuntimeError("stdin queue closed") from exc
+
+    return deliver
+
+
 def create_server(unity_client: UnityBridgeClient) -> Server:
     """Create MCP server that proxies requests to Unity."""
     server = Server("unity-code-mcp-stdio")
+    list_result_cache = _ListResultCache()
 
     @server.list_tools()
     async def list_tools() -> list[types.Tool]:
+        cached = list_result_cache.get("tools/list")
+        if cached is not None:
+            return cached
+
         response = await unity_client.send_request(
-            {
-                "jsonrpc": "2.0",
-                "id": "list_tools",
-                "method": "tools/list",
-                "params": {},
-            }
+            _LIST_TOOLS_REQUEST, _LIST_TOOLS_REQUEST_BYTES
         )
 
         if "error" in response:
             logger.error("Error listing tools: %s", response["error"])
+            list_result_cache.clear()
             return []
 
         result = response.get("result", {})
-        tools = result.get("tools", [])
-        return [
+        tools = [
             types.Tool(
                 name=tool["name"],
                 description=tool.get("description", ""),
                 inputSchema=tool.get("inputSchema", {"type": "object"}),
             )
-            for tool in tools
+            for tool in result.get("tools", [])
         ]
+        list_result_cache.put("tools/list", tools)
+        return tools
 
     @server.call_tool()
     async def call_tool(name: str, arguments: dict[str, Any]) -> types.CallToolResult:
@@ -429,22 +862,21 @@ def create_server(unity_client: UnityBridgeClient) -> Server:
 
     @server.list_prompts()
     async def list_prompts() -> list[types.Prompt]:
+        cached = list_result_cache.get("prompts/list")
+        if cached is not None:
+            return cached
+
         response = await unity_client.send_request(
-            {
-                "jsonrpc": "2.0",
-                "id": "list_prompts",
-                "method": "prompts/list",
-                "params": {},
-            }
+            _LIST_PROMPTS_REQUEST, _LIST_PROMPTS_REQUEST_BYTES
         )
 
         if "error" in response:
             logger.error("Error listing prompts: %s", response["error"])
+            list_result_cache.clear()
             return []
 
         result = response.get("result", {})
-        prompts = result.get("prompts", [])
-        return [
+        prompts = [
             types.Prompt(
                 name=prompt["name"],
                 description=prompt.get("description"),
@@ -457,8 +889,10 @@ def create_server(unity_client: UnityBridgeClient) -> Server:
                     for arg in prompt.get("arguments", [])
                 ],
             )
-            for prompt in prompts
+            for prompt in result.get("prompts", [])
         ]
+        list_result_cache.put("prompts/list", prompts)
+        return prompts
 
     @server.get_prompt()
     async def get_prompt(
@@ -498,30 +932,31 @@ def create_server(unity_client: UnityBridgeClient) -> Server:
 
     @server.list_resources()
     async def list_resources() -> list[types.Resource]:
+        cached = list_result_cache.get("resources/list")
+        if cached is not None:
+            return cached
+
         response = await unity_client.send_request(
-            {
-                "jsonrpc": "2.0",
-                "id": "list_resources",
-                "method": "resources/list",
-                "params": {},
-            }
+            _LIST_RESOURCES_REQUEST, _LIST_RESOURCES_REQUEST_BYTES
         )
 
         if "error" in response:
             logger.error("Error listing resources: %s", response["error"])
+            list_result_cache.clear()
             return []
 
         result = response.get("result", {})
-        resources = result.get("resources", [])
-        return [
+        resources = [
             types.Resource(
                 uri=resource["uri"],
                 name=resource.get("name", ""),
                 description=resource.get("description"),
                 mimeType=resource.get("mimeType"),
             )
-            for resource in resources
+            for resource in result.get("resources", [])
         ]
+        list_result_cache.put("resources/list", resources)
+        return resources
 
     @server.read_resource()
     async def read_resource(uri: AnyUrl) -> str:
@@ -576,66 +1011,90 @@ async def run_server(request_timeout: float, project_root: Path | None = None):
         ](max_buffer_size=100)
 
         async def stdin_reader():
-            raw_stdin = sys.stdin.buffer
-            last_line_text = ""
-
-            def read_line():
-                return raw_stdin.readline()
+            loop = asyncio.get_running_loop()
+            # A bounded queue keeps a fast client blocked in its stdin write,
+            # as the old blocking read did, instead of buffering without limit.
+            lines: asyncio.Queue[bytes | None] = asyncio.Queue(STDIN_LINE_QUEUE_SIZE)
+            last_line = b""
+
+            threading.Thread(
+                target=_pump_stdin_lines,
+                args=(sys.stdin.buffer, _deliver_to_queue(loop, lines)),
+                name="unity-code-mcp-stdin",
+                daemon=True,
+            ).start()
 
             try:
-                while True:
-                    line = await anyio.to_thread.run_sync(read_line)  # type: ignore[attr-defined]
-                    if not line:
-                        logger.info("stdin EOF")
-                        break
-
-                    line_text = line.decode("utf-8").strip()
-                    if not line_text:
+                while (line := await lines.get()) is not None:
+                    if not line or line.isspace():
                         continue
-                    last_line_text = line_text
-
-                    logger.debug(
-                        "stdin line received bytes=%s preview=%s",
-                        len(line),
-                        _truncate_for_log(line_text),
-                    )
-
-                    message = JSONRPCMessage.model_validate_json(line_text)
+                    last_line = line
+
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(
+                            "stdin line received bytes=%s preview=%s",
+                            len(line),
+                            _truncate_for_log(line.decode("utf-8", "replace").strip()),
+                        )
+
+                    # pydantic parses UTF-8 bytes directly and ignores the
+                    # surrounding whitespace, so no decode/strip copy is needed.
+                    message = JSONRPCMessage.model_validate_json(line)
                     await client_to_server_send.send(SessionMessage(message=message))
+                logger.info("stdin EOF")
             except anyio.ClosedResourceError:
                 logger.info("stdin reader stopped after client stream closed")
             except Exception:
                 logger.error(
                     "stdin_reader error line_preview=%s",
-                    _truncate_for_log(last_line_text) if last_line_text else "<none>",
+                    (
+                        _truncate_for_log(last_line.decode("utf-8", "replace"))
+                        if last_line
+                        else "<none>"
+                    ),
                     exc_info=True,
                 )
             finally:
                 await client_to_server_send.aclose()
 
         async def stdout_writer():
-            raw_stdout = sys.stdout.buffer
-            last_message_summary = "<none>"
-
-            def write_data(data: bytes):
-                raw_stdout.write(data)
+            raw_stdout = _open_stdout_writer()
+            last_message = b""
+
+            def write_frames(chunks: list[bytes]):
+                # Payloads and delimiters are handed over separately so a large
+                # message is never copied just to append the newline, and a
+                # whole batch costs a single flush.
+                raw_stdout.writelines(chunks)
                 raw_stdout.flush()
 
             try:
                 async for session_msg in server_to_client_recv:
-                    json_str = session_msg.message.model_dump_json(
-                        by_alias=True, exclude_none=True
-                    )
-                    last_message_summary = _truncate_for_log(json_str)
+                    batch = [session_msg]
+                    while True:
+                        try:
+                            batch.append(server_to_client_recv.receive_nowait())
+                        except (anyio.WouldBlock, anyio.EndOfStream):
+                            break
+
+                    chunks: list[bytes] = []
+                    for queued_msg in batch:
+                        last_message = _encode_jsonrpc_message(queued_msg.message)
+                        chunks += (last_message, STDIO_FRAME_DELIMITER)
+
                     await anyio.to_thread.run_sync(  # type: ignore[attr-defined]
-                        lambda: write_data((json_str + "\n").encode("utf-8"))
+                        write_frames, chunks
                     )
             except anyio.ClosedResourceError:
                 logger.info("stdout writer stopped after server stream closed")
             except Exception:
                 logger.error(
                     "stdout_writer error last_message=%s",
-                    last_message_summary,
+                    (
+                        _truncate_for_log(last_message.decode("utf-8", "replace"))
+                        if last_message
+                        else "<none>"
+                    ),
                     exc_info=True,
                 )
 
@@ -657,6 +1116,20 @@ async def run_server(request_timeout: float, project_root: Path | None = None):
             await unity_client.disconnect(reason="server-shutdown")
 
 
+def _run_event_loop(main_coroutine: Coroutine[Any, Any, None]) -> None:
+    """Run the bridge on uvloop where it is available, else on asyncio."""
+    if sys.platform != "win32":
+        try:
+            import uvloop
+        except ImportError:
+            pass
+        else:
+            uvloop.run(main_coroutine)
+            return
+
+    asyncio.run(main_coroutine)
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(
         description="MCP STDIO Bridge for Unity Code MCP Server over files",
@@ -670,7 +1143,7 @@ def main() -> None:
     )
 
     args = parser.parse_args()
-    asyncio.run(run_server(args.request_timeout))
+    _run_event_loop(run_server(args.request_timeout))
 
 
 if __name__ == "__main__":
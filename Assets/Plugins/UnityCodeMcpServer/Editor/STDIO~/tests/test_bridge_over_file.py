@@ -1,21 +1,39 @@
 """Tests for the file-backed Unity Code MCP STDIO bridge."""
 
+import asyncio
 import importlib.util
+import io
 import json
 import logging
 from pathlib import Path
+import subprocess
 import sys
+import threading
+import time
+from types import SimpleNamespace
 from unittest.mock import AsyncMock
 
 import pytest
 from mcp import types
+from pydantic import ValidationError
 
 from unity_code_mcp_stdio.unity_code_mcp_stdio import (
     DEFAULT_FILE_REQUEST_TIMEOUT,
     FileBridgePaths,
+    FlushingHandler,
     UnityFileClient,
-    _write_text_atomically,
+    _build_rotating_handler,
+    _next_request_timestamp,
+    _write_bytes_atomically,
+    _ListResultCache,
     _build_call_tool_result,
+    _encode_jsonrpc_message,
+    _json_loads,
+    _open_stdout_writer,
+    _run_event_loop,
+    _pump_stdin_lines,
+    _deliver_to_queue,
+    create_server,
     get_project_root,
 )
 
@@ -68,11 +86,32 @@ class TestFileBridgePaths:
         assert request_path.name == "20260504123456789_request_client-123.json"
         assert request_path.parent == tmp_path / ".unityCodeMcpServer" / "messages"
 
+    def test_next_request_timestamp_bumps_to_next_unused_millisecond(self):
+        timestamps = [_next_request_timestamp() for _ in range(50)]
+
+        assert all(len(timestamp) == 17 for timestamp in timestamps)
+        assert all(timestamp.isdigit() for timestamp in timestamps)
+        assert timestamps == sorted(set(timestamps))
+
     def test_module_loads_in_isolation(self):
         module = load_bridge_over_file_module()
 
         assert module.DEFAULT_FILE_REQUEST_TIMEOUT == 180.0
 
+    def test_module_silences_stderr_at_the_file_descriptor_level(self):
+        script = (
+            "import os, runpy, sys\n"
+            f"runpy.run_path({str(MODULE_PATH)!r}, run_name='bridge')\n"
+            "print('python stderr', file=sys.stderr)\n"
+            "os.write(2, b'raw stderr')\n"
+        )
+
+        completed = subprocess.run(
+            [sys.executable, "-c", script], capture_output=True, check=True
+        )
+
+        assert completed.stderr == b""
+
     def test_module_configures_file_logging_on_import(self):
         module = load_bridge_over_file_module()
 
@@ -81,14 +120,121 @@ class TestFileBridgePaths:
             for handler in module.logger.handlers
         )
 
+    def test_log_handler_batches_flushes_but_flushes_warnings_immediately(
+        self, tmp_path
+    ):
+        log_path = tmp_path / "bridge.log"
+        handler = _build_rotating_handler(log_path)
+        handler._last_flush = time.monotonic() + 3600
+
+        def emit(level: int) -> None:
+            handler.emit(logging.LogRecord("bridge", level, __file__, 1, "m", (), None))
+
+        try:
+            for _ in range(31):
+                emit(logging.INFO)
+            assert log_path.stat().st_size == 0
+
+            emit(logging.INFO)
+            flushed_size = log_path.stat().st_size
+            assert flushed_size > 0
+
+            emit(logging.INFO)
+            assert log_path.stat().st_size == flushed_size
+
+            emit(logging.WARNING)
+            assert log_path.stat().st_size > flushed_size
+        finally:
+            handler.close()
+
+    def test_log_handler_flushes_buffered_records_when_logging_goes_idle(
+        self, tmp_path
+    ):
+        log_path = tmp_path / "bridge.log"
+        handler = _build_rotating_handler(log_path)
+        handler._last_flush = time.monotonic()
+
+        try:
+            for _ in range(6):
+                handler.emit(
+                    logging.LogRecord(
+                        "bridge", logging.INFO, __file__, 1, "m", (), None
+                    )
+                )
+            assert log_path.stat().st_size == 0
+
+            deadline = time.monotonic() + 2.0
+            while log_path.stat().st_size == 0 and time.monotonic() < deadline:
+                time.sleep(0.05)
+
+            assert log_path.stat().st_size > 0
+        finally:
+            handler.close()
+
+    def test_log_handler_rereads_file_size_after_flushing(self, tmp_path):
+        log_path = tmp_path / "bridge.log"
+        handler = FlushingHandler(str(log_path), maxBytes=200, backupCount=1)
+
+        def emit(level: int) -> None:
+            handler.emit(
+                logging.LogRecord("bridge", level, __file__, 1, "x" * 40, (), None)
+            )
+
+        try:
+            emit(logging.WARNING)
+            with log_path.open("a", encoding="utf-8") as other_bridge:
+                other_bridge.write("y" * 150)
+
+            emit(logging.WARNING)
+        finally:
+            handler.close()
+
+        assert (tmp_path / "bridge.log.1").exists()
+
+    def test_log_handler_rolls_over_at_max_bytes(self, tmp_path):
+        log_path = tmp_path / "bridge.log"
+        handler = FlushingHandler(str(log_path), maxBytes=200, backupCount=1)
+
+        try:
+            for _ in range(10):
+                handler.emit(
+                    logging.LogRecord(
+                        "bridge", logging.INFO, __file__, 1, "x" * 40, (), None
+                    )
+                )
+        finally:
+            handler.close()
+
+        assert (tmp_path / "bridge.log.1").exists()
+        assert log_path.stat().st_size < 200
+
+    def test_run_event_loop_prefers_uvloop_outside_windows(self, monkeypatch):
+        runners: list[str] = []
+
+        def fake_uvloop_run(coroutine):
+            runners.append("uvloop")
+            asyncio.run(coroutine)
+
+        async def bridge():
+            runners.append("bridge")
+
+        monkeypatch.setitem(sys.modules, "uvloop", SimpleNamespace(run=fake_uvloop_run))
+        monkeypatch.setattr(sys, "platform", "linux")
+        _run_event_loop(bridge())
+
+        monkeypatch.setattr(sys, "platform", "win32")
+        _run_event_loop(bridge())
+
+        assert runners == ["uvloop", "bridge", "bridge"]
+
 
 class TestUnityFileClient:
-    def test_write_text_atomically_replaces_file_without_leaving_temp_files(
+    def test_write_bytes_atomically_replaces_file_without_leaving_temp_files(
         self, tmp_path
     ):
         target_path = tmp_path / "request.json"
 
-        _write_text_atomically(target_path, '{"jsonrpc":"2.0"}')
+        _write_bytes_atomically(target_path, b'{"jsonrpc":"2.0"}')
 
         assert target_path.read_text(encoding="utf-8") == '{"jsonrpc":"2.0"}'
         assert list(tmp_path.glob("*.tmp")) == []
@@ -130,6 +276,154 @@ class TestUnityFileClient:
         assert list(client.paths.messages_dir.glob("*_request_client-123.json")) == []
         assert list(client.paths.messages_dir.glob("*_response_client-123.json")) == []
 
+    @pytest.mark.asyncio
+    async def test_send_request_writes_request_payload_as_utf8_json(self, tmp_path):
+        client = UnityFileClient(
+            project_root=tmp_path,
+            client_id="client-123",
+            request_timeout=1.0,
+        )
+        request_payload = {
+            "jsonrpc": "2.0",
+            "id": "call_tool_echo",
+            "method": "tools/call",
+            "params": {"name": "echo", "arguments": {"text": "zażółć"}},
+        }
+        written_payloads: list[dict] = []
+
+        async def fake_wait_for_response(response_path):
+            request_path = next(
+                client.paths.messages_dir.glob("*_request_client-123.json")
+            )
+            written_payloads.append(
+                json.loads(request_path.read_bytes().decode("utf-8"))
+            )
+            response_path.write_bytes(
+                '{"jsonrpc":"2.0","id":"call_tool_echo","result":{"text":"zażółć"}}'.encode(
+                    "utf-8"
+                )
+            )
+
+        client._wait_for_response = fake_wait_for_response
+
+        response = await client.send_request(request_payload)
+
+        assert written_payloads == [request_payload]
+        assert response["result"] == {"text": "zażółć"}
+
+    @pytest.mark.asyncio
+    async def test_send_request_writes_pre_encoded_request_bytes_verbatim(
+        self, tmp_path
+    ):
+        client = UnityFileClient(
+            project_root=tmp_path,
+            client_id="client-123",
+            request_timeout=1.0,
+        )
+        request_payload = {"jsonrpc": "2.0", "id": "list_tools", "method": "tools/list"}
+        request_bytes = b'{"jsonrpc":"2.0","id":"list_tools","method":"tools/list"}'
+        written_bytes: list[bytes] = []
+
+        async def fake_wait_for_response(response_path):
+            request_path = next(
+                client.paths.messages_dir.glob("*_request_client-123.json")
+            )
+            written_bytes.append(request_path.read_bytes())
+            response_path.write_bytes(
+                b'{"jsonrpc":"2.0","id":"list_tools","result":{"tools":[]}}'
+            )
+
+        client._wait_for_response = fake_wait_for_response
+
+        response = await client.send_request(request_payload, request_bytes)
+
+        assert written_bytes == [request_bytes]
+        assert response["result"] == {"tools": []}
+
+    @pytest.mark.asyncio
+    async def test_send_request_keeps_integers_beyond_64_bits_exact(self, tmp_path):
+        client = UnityFileClient(
+            project_root=tmp_path,
+            client_id="client-123",
+            request_timeout=1.0,
+        )
+        big = 2**64 + 1
+        request_payload = {
+            "jsonrpc": "2.0",
+            "id": "call",
+            "method": "tools/call",
+            "params": {"name": "echo", "arguments": {"value": big}},
+        }
+
+        async def fake_wait_for_response(response_path):
+            request_path = next(
+                client.paths.messages_dir.glob("*_request_client-123.json")
+            )
+            request = json.loads(request_path.read_bytes())
+            assert request["params"]["arguments"]["value"] == big
+            response_path.write_text(
+                json.dumps({"jsonrpc": "2.0", "id": "call", "result": {"value": -big}}),
+                encoding="utf-8",
+            )
+
+        client._wait_for_response = fake_wait_for_response
+
+        response = await client.send_request(request_payload)
+
+        assert response["result"] == {"value": -big}
+
+    def test_read_response_reuses_buffer_and_falls_back_for_large_files(self, tmp_path):
+        client = UnityFileClient(project_root=tmp_path, client_id="client-123")
+        client._response_buffer = bytearray(16)
+        small_path = tmp_path / "small.json"
+        large_path = tmp_path / "large.json"
+        small_path.write_bytes(b'{"id":"small"}')
+        large_path.write_bytes(b'{"id":"large","result":{}}')
+
+        small = client._read_response(small_path)
+        assert isinstance(small, memoryview)
+        assert small.obj is client._response_buffer
+        assert json.loads(small.tobytes()) == {"id": "small"}
+
+        large = client._read_response(large_path)
+        assert isinstance(large, bytes)
+        assert json.loads(large) == {"id": "large", "result": {}}
+
+    @pytest.mark.asyncio
+    async def test_send_request_parses_large_response_off_the_event_loop(
+        self, tmp_path, monkeypatch
+    ):
+        client = UnityFileClient(
+            project_root=tmp_path,
+            client_id="client-123",
+            request_timeout=1.0,
+        )
+        large_text = "x" * (128 * 1024)
+        offloaded: list[object] = []
+        to_thread = asyncio.to_thread
+
+        async def recording_to_thread(func, *args):
+            offloaded.append(func)
+            return await to_thread(func, *args)
+
+        async def fake_wait_for_response(response_path):
+            response_path.write_text(
+                json.dumps(
+                    {"jsonrpc": "2.0", "id": "read", "result": {"text": large_text}}
+                ),
+                encoding="utf-8",
+            )
+
+        monkeypatch.setattr(asyncio, "to_thread", recording_to_thread)
+        client._wait_for_response = fake_wait_for_response
+
+        response = await client.send_request(
+            {"jsonrpc": "2.0", "id": "read", "method": "resources/read"}
+        )
+
+        assert response["result"]["text"] == large_text
+        assert offloaded.count(_json_loads) == 1
+
     @pytest.mark.asyncio
     async def test_send_request_succeeds_after_unity_deletes_request_file(
         self, tmp_path
@@ -199,6 +493,223 @@ class TestUnityFileClient:
         )
         assert list(client.paths.messages_dir.glob("*_request_client-123.json")) == []
 
+    @pytest.mark.asyncio
+    async def test_send_request_keeps_concurrent_requests_in_flight(self, tmp_path):
+        client = UnityFileClient(
+            project_root=tmp_path,
+            client_id="client-123",
+            request_timeout=2.0,
+            response_poll_interval=0.01,
+        )
+
+        async def fake_unity():
+            messages_dir = client.paths.messages_dir
+            while True:
+                request_paths = sorted(messages_dir.glob("*_request_client-123.json"))
+                if len(request_paths) == 2:
+                    break
+                await asyncio.sleep(0.01)
+
+            # Answer in reverse order to prove responses are matched per request.
+            for request_path in reversed(request_paths):
+                request = json.loads(request_path.read_bytes())
+                response_path = request_path.with_name(
+                    request_path.name.replace("_request_", "_response_")
+                )
+                response_path.write_text(
+                    json.dumps({"jsonrpc": "2.0", "id": request["id"], "result": {}}),
+                    encoding="utf-8",
+                )
+
+        first, second, _ = await asyncio.gather(
+            client.send_request(
+                {"jsonrpc": "2.0", "id": "first", "method": "tools/list"}
+            ),
+            client.send_request(
+                {"jsonrpc": "2.0", "id": "second", "method": "prompts/list"}
+            ),
+            fake_unity(),
+        )
+
+        assert first["id"] == "first"
+        assert second["id"] == "second"
+        assert list(client.paths.messages_dir.iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_send_request_starts_timeout_after_earlier_requests_finish(
+        self, tmp_path
+    ):
+        client = UnityFileClient(
+            project_root=tmp_path,
+            client_id="client-123",
+            request_timeout=0.5,
+            response_poll_interval=0.01,
+        )
+
+        async def fake_unity():
+            messages_dir = client.paths.messages_dir
+            while True:
+                request_paths = sorted(messages_dir.glob("*_request_client-123.json"))
+                if len(request_paths) == 2:
+                    break
+                await asyncio.sleep(0.01)
+
+            # Like Unity, handle one request at a time; both together exceed
+            # the timeout, but neither does on its own.
+            for request_path in request_paths:
+                await asyncio.sleep(0.3)
+                request = json.loads(request_path.read_bytes())
+                request_path.with_name(
+                    request_path.name.replace("_request_", "_response_")
+                ).write_text(
+                    json.dumps({"jsonrpc": "2.0", "id": request["id"], "result": {}}),
+                    encoding="utf-8",
+                )
+
+        first, second, _ = await asyncio.gather(
+            client.send_request(
+                {"jsonrpc": "2.0", "id": "first", "method": "tools/list"}
+            ),
+            client.send_request(
+                {"jsonrpc": "2.0", "id": "second", "method": "prompts/list"}
+            ),
+            fake_unity(),
+        )
+
+        assert first == {"jsonrpc": "2.0", "id": "first", "result": {}}
+        assert second == {"jsonrpc": "2.0", "id": "second", "result": {}}
+
+    @pytest.mark.asyncio
+    async def test_send_request_detects_quick_response_before_full_poll_interval(
+        self, tmp_path
+    ):
+        client = UnityFileClient(
+            project_root=tmp_path,
+            client_id="client-123",
+            request_timeout=5.0,
+            response_poll_interval=2.0,
+        )
+
+        async def fake_unity():
+            messages_dir = client.paths.messages_dir
+            while not list(messages_dir.glob("*_request_client-123.json")):
+                await asyncio.sleep(0.005)
+            await asyncio.sleep(0.05)
+            request_path = next(messages_dir.glob("*_request_client-123.json"))
+            request_path.with_name(
+                request_path.name.replace("_request_", "_response_")
+            ).write_text('{"jsonrpc":"2.0","id":"ping","result":{}}', encoding="utf-8")
+
+        started = time.monotonic()
+        response, _ = await asyncio.gather(
+            client.send_request({"jsonrpc": "2.0", "id": "ping", "method": "ping"}),
+            fake_unity(),
+        )
+
+        assert response["result"] == {}
+        assert time.monotonic() - started < 1.0
+
+    @pytest.mark.asyncio
+    async def test_send_request_publishes_queued_requests_in_one_batch(self, tmp_path):
+        client = UnityFileClient(
+            project_root=tmp_path,
+            client_id="client-123",
+            request_timeout=1.0,
+        )
+        batch_sizes: list[int] = []
+        publish_requests = client._publish_requests
+
+        def recording_publish_requests(batch):
+            batch_sizes.append(len(batch))
+            return publish_requests(batch)
+
+        async def fake_wait_for_response(response_path):
+            response_path.write_text(
+                json.dumps({"jsonrpc": "2.0", "id": "tools", "result": {}}),
+                encoding="utf-8",
+            )
+
+        client._publish_requests = recording_publish_requests
+        client._wait_for_response = fake_wait_for_response
+
+        responses = await asyncio.gather(
+            *(
+                client.send_request(
+                    {"jsonrpc": "2.0", "id": "tools", "method": "tools/list"}
+                )
+                for _ in range(3)
+            )
+        )
+
+        assert [response["result"] for response in responses] == [{}, {}, {}]
+        assert batch_sizes == [3]
+
+
+class TestStdinPump:
+    def test_pump_stdin_lines_splits_lines_across_read_chunks(self):
+        delivered: list[bytes | None] = []
+        stream = io.BytesIO(b'{"id":1}\n\n{"id":22}\r\n{"id":3}')
+
+        _pump_stdin_lines(stream, delivered.append, chunk_size=4)
+
+        assert delivered == [b'{"id":1}', b"", b'{"id":22}\r', b'{"id":3}', None]
+
+    @pytest.mark.asyncio
+    async def test_pump_stdin_lines_blocks_while_the_line_queue_is_full(self):
+        loop = asyncio.get_running_loop()
+        lines: asyncio.Queue[bytes | None] = asyncio.Queue(maxsize=1)
+        pump = threading.Thread(
+            target=_pump_stdin_lines,
+            args=(io.BytesIO(b"a\nb\nc\n"), _deliver_to_queue(loop, lines)),
+            daemon=True,
+        )
+        pump.start()
+
+        await asyncio.sleep(0.1)
+        assert pump.is_alive()
+        assert lines.qsize() == 1
+
+        received = [await lines.get() for _ in range(4)]
+        await asyncio.to_thread(pump.join, 1.0)
+
+        assert received == [b"a", b"b", b"c", None]
+        assert not pump.is_alive()
+
+
+class TestStdoutEncoding:
+    def test_encode_jsonrpc_message_matches_pydantic_serialization(self):
+        message = types.JSONRPCMessage(
+            types.JSONRPCResponse(
+                jsonrpc="2.0",
+                id=7,
+                result={"contents": [{"uri": "unity://scene", "text": "żółw"}]},
+            )
+        )
+
+        encoded = _encode_jsonrpc_message(message)
+
+        assert b"\n" not in encoded
+        assert json.loads(encoded) == json.loads(
+            message.model_dump_json(by_alias=True, exclude_none=True)
+        )
+
+    def test_open_stdout_writer_buffers_batches_on_stdout_descriptor(
+        self, tmp_path, monkeypatch
+    ):
+        output_path = tmp_path / "stdout.jsonl"
+        with output_path.open("w", encoding="utf-8") as fake_stdout:
+            monkeypatch.setattr(sys, "stdout", fake_stdout)
+            writer = _open_stdout_writer()
+
+            writer.writelines((b'{"id":1}', b"\n", b'{"id":2}', b"\n"))
+            assert output_path.read_bytes() == b""
+
+            writer.flush()
+            writer.close()
+            assert fake_stdout.closed is False
+
+        assert output_path.read_bytes() == b'{"id":1}\n{"id":2}\n'
+
 
 class TestToolErrorHandling:
     @pytest.mark.asyncio
@@ -227,3 +738,115 @@ class TestToolErrorHandling:
         assert isinstance(result, types.CallToolResult)
         assert result.isError is True
         assert result.content[0].text == "Tool execution error: main-thread only API"
+
+
+class TestListResultCache:
+    @pytest.mark.asyncio
+    async def test_list_tools_reuses_parsed_tools_within_ttl(self):
+        client = AsyncMock()
+        client.send_request.return_value = {
+            "jsonrpc": "2.0",
+            "id": "list_tools",
+            "result": {"tools": [{"name": "get_unity_info"}]},
+        }
+        server = create_server(client)
+        list_tools = server.request_handlers[types.ListToolsRequest]
+        request = types.ListToolsRequest(method="tools/list")
+
+        first = await list_tools(request)
+        second = await list_tools(request)
+
+        assert client.send_request.await_count == 1
+        request_payload, request_bytes = client.send_request.await_args.args
+        assert json.loads(request_bytes) == request_payload
+        assert request_payload["method"] == "tools/list"
+        assert first.root.tools == second.root.tools
+        assert second.root.tools[0].name == "get_unity_info"
+
+    @pytest.mark.asyncio
+    async def test_list_error_clears_cache_so_next_call_asks_unity_again(self):
+        client = AsyncMock()
+        tools_response = {
+            "jsonrpc": "2.0",
+            "id": "list_tools",
+            "result": {"tools": [{"name": "get_unity_info"}]},
+        }
+        client.send_request.side_effect = [
+            tools_response,
+            {
+                "jsonrpc": "2.0",
+                "id": "list_prompts",
+                "error": {"code": -32603, "message": "Unity is recompiling"},
+            },
+            tools_response,
+        ]
+        server = create_server(client)
+        list_tools = server.request_handlers[types.ListToolsRequest]
+        list_prompts = server.request_handlers[types.ListPromptsRequest]
+
+        await list_tools(types.ListToolsRequest(method="tools/list"))
+        failed = await list_prompts(types.ListPromptsRequest(method="prompts/list"))
+        refreshed = await list_tools(types.ListToolsRequest(method="tools/list"))
+
+        assert failed.root.prompts == []
+        assert client.send_request.await_count == 3
+        assert refreshed.root.tools[0].name == "get_unity_info"
+
+    @pytest.mark.asyncio
+    async def test_list_prompts_serializes_prompt_arguments(self):
+        client = AsyncMock()
+        client.send_request.return_value = {
+            "jsonrpc": "2.0",
+            "id": "list_prompts",
+            "result": {
+                "prompts": [
+                    {
+                        "name": "review",
+                        "description": "Review a scene",
+                        "arguments": [{"name": "scene", "required": True}],
+                    }
+                ]
+            },
+        }
+        server = create_server(client)
+        list_prompts = server.request_handlers[types.ListPromptsRequest]
+
+        result = await list_prompts(types.ListPromptsRequest(method="prompts/list"))
+
+        assert result.model_dump(mode="json", by_alias=True, exclude_none=True) == {
+            "prompts": [
+                {
+                    "name": "review",
+                    "description": "Review a scene",
+                    "arguments": [{"name": "scene", "required": True}],
+                }
+            ]
+        }
+
+    @pytest.mark.asyncio
+    async def test_list_tools_rejects_malformed_tool_definitions(self):
+        client = AsyncMock()
+        client.send_request.return_value = {
+            "jsonrpc": "2.0",
+            "id": "list_tools",
+            "result": {"tools": [{"name": "get_unity_info", "inputSchema": None}]},
+        }
+        server = create_server(client)
+        list_tools = server.request_handlers[types.ListToolsRequest]
+
+        with pytest.raises(ValidationError):
+            await list_tools(types.ListToolsRequest(method="tools/list"))
+
+    def test_cache_keeps_one_result_per_method_until_it_expires(self):
+        cache = _ListResultCache(ttl_seconds=60.0)
+
+        cache.put("tools/list", ["tool"])
+        cache.put("prompts/list", ["prompt"])
+        cache.put("tools/list", ["newer tool"])
+
+        assert cache.get("tools/list") == ["newer tool"]
+        assert cache.get("prompts/list") == ["prompt"]
+        assert cache.get("resources/list") is None
+
+        cache.ttl_seconds = -1.0
+        assert cache.get("tools/list") is None
@@ -21,11 +21,22 @@ Usage:
 
 import argparse
 import asyncio
+import atexit
+import contextlib
+import ctypes
+from ctypes import wintypes
 import os
+import re
+import sys
+import traceback
+import unittest
+from contextlib import AsyncExitStack
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 
 from mcp import ClientSession
+from mcp.types import CallToolResult, ImageContent, TextContent
 import pygetwindow as gw
 from mcp.client.stdio import stdio_client, StdioServerParameters
 
@@ -41,6 +52,63 @@ STDIO_BRIDGE_PATH = (
 ORIGINAL_CODE = "rb.linearVelocity = Vector3.zero;"
 MODIFIED_CODE = "rb.velocity = Vector3.zero;"
 COMMENT_PREFIX = "// dll-lock-timestamp: "
+ORIGINAL_CODE_BYTES = ORIGINAL_CODE.encode("ascii")
+MODIFIED_CODE_BYTES = MODIFIED_CODE.encode("ascii")
+COMMENT_PREFIX_BYTES = COMMENT_PREFIX.encode("ascii")
+_TIMESTAMP_LINE_RE = re.compile(
+    rb"(?m)^" + re.escape(COMMENT_PREFIX_BYTES) + rb"[^\r\n]*"
+)
+
+REQUIRED_TOOL = "execute_csharp_script_in_unity_editor"
+OUTPUT_PREVIEW_LIMIT = 2000
+UNITY_WINDOW_TITLE = "UnityCodeMcpServer - SampleScene"
+_SW_RESTORE = 9
+_WINDOW_TITLE_BUFFER_SIZE = 512
+
+# C# scripts sent to REQUIRED_TOOL, with their fixed tool arguments
+TEST_SCRIPT = 'Debug.Log("DLL Lock Test: Script executed successfully at " + System.DateTime.Now);'
+REBUILD_SCRIPT = (
+    "UnityEditor.Compilation.CompilationPipeline.RequestScriptCompilation();"
+    "UnityEditor.AssetDatabase.Refresh();"
+    'Debug.Log("DLL Lock Test: Requested script compilation at " + System.DateTime.Now);'
+)
+_TEST_SCRIPT_ARGUMENTS = {"script": TEST_SCRIPT}
+_REBUILD_SCRIPT_ARGUMENTS = {"script": REBUILD_SCRIPT}
+
+_BANNER_TEMPLATE = f"\n{'-' * 70}\n{{}}\n{'-' * 70}\n"
+
+# Steps accepted by --steps, and the subset that needs an MCP session
+_VALID_STEPS = frozenset({"modify", "rebuild", "wait", "execute", "timestamp", "focus"})
+_MCP_STEPS = frozenset({"rebuild", "execute"})
+# Internal step that replaces an adjacent modify/timestamp pair in run_steps
+_FUSED_FILE_STEP = "modify+timestamp"
+
+# Binary, non-inheritable handles (the extra flags only exist on Windows)
+_OPEN_FLAGS = getattr(os, "O_BINARY", 0) | getattr(os, "O_NOINHERIT", 0)
+_READ_FLAGS = os.O_RDONLY | _OPEN_FLAGS
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | _OPEN_FLAGS
+_FILE_BUFFER_SIZE = 64 * 1024
+
+
+@dataclass
+class _CachedSession:
+    """An initialized MCP session kept open for reuse within this process."""
+
+    exit_stack: AsyncExitStack
+    session: ClientSession
+
+
+# Bridge stderr goes to devnull to suppress MCP library noise; opened once and
+# shared by every bridge process
+_DEVNULL = open(os.devnull, "wb", buffering=0)
+atexit.register(_DEVNULL.close)
+
+# Open MCP sessions keyed by (host, port); see _get_session and close_sessions
+_SESSIONS: dict[tuple[str, int], _CachedSession] = {}
+_SESSION_LOCK = asyncio.Lock()
+# Servers already known to expose REQUIRED_TOOL; the bridge version is pinned by
+# the uv project, so the tool list does not change within one process
+_VALIDATED_SERVERS: set[tuple[str, int]] = set()
 
 
 def get_server_params(host: str, port: int) -> StdioServerParameters:
@@ -60,6 +128,127 @@ def get_server_params(host: str, port: int) -> StdioServerParameters:
     )
 
 
+async def _get_session(host: str, port: int) -> _CachedSession:
+    """Return the shared MCP session for host/port, starting the bridge if needed."""
+    async with _SESSION_LOCK:
+        cached = _SESSIONS.get((host, port))
+        if cached is not None:
+            return cached
+
+        exit_stack = AsyncExitStack()
+        try:
+            read, write = await exit_stack.enter_async_context(
+                stdio_client(get_server_params(host, port), errlog=_DEVNULL)
+            )
+            session = await exit_stack.enter_async_context(ClientSession(read, write))
+            await session.initialize()
+        except BaseException:
+            await exit_stack.aclose()
+            raise
+
+        print("[OK] Connected to Unity MCP Server via STDIO bridge")
+        cached = _SESSIONS[(host, port)] = _CachedSession(exit_stack, session)
+        return cached
+
+
+async def _discard_session(host: str, port: int) -> None:
+    """Drop a session that failed so the next call reconnects."""
+    async with _SESSION_LOCK:
+        cached = _SESSIONS.pop((host, port), None)
+    if cached is not None:
+        with contextlib.suppress(Exception):
+            await cached.exit_stack.aclose()
+
+
+async def close_sessions() -> None:
+    """Close every cached MCP session and its STDIO bridge process."""
+    async with _SESSION_LOCK:
+        sessions = list(_SESSIONS.values())
+        _SESSIONS.clear()
+    for cached in sessions:
+        await cached.exit_stack.aclose()
+
+
+def _read_file(path: Path) -> bytes:
+    """Read a file in one buffered read through a binary, non-inheritable handle."""
+    with open(os.open(path, _READ_FLAGS), "rb", buffering=_FILE_BUFFER_SIZE) as file:
+        return file.read()
+
+
+def _write_file(path: Path, content: bytes) -> None:
+    """
+    Replace a file atomically.
+
+    The content goes to a sibling .tmp file (ignored by Unity's asset
+    importer) which is then moved over the target, so Unity never sees a
+    truncated or half-written file.
+    """
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    try:
+        with open(
+            os.open(tmp_path, _WRITE_FLAGS, 0o666), "wb", buffering=_FILE_BUFFER_SIZE
+        ) as file:
+            file.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _read_dll_lock_file() -> bytes | None:
+    """Read DllLock.cs, reporting a missing file instead of raising."""
+    try:
+        return _read_file(DLL_LOCK_CS_PATH)
+    except FileNotFoundError:
+        print(f"[ERROR] DllLock.cs not found at: {DLL_LOCK_CS_PATH}")
+        return None
+
+
+def _swap_velocity_code(content: bytes, to_velocity: bool) -> bytes | None:
+    """
+    Swap the velocity pattern in DllLock.cs content.
+
+    Returns:
+        The updated content, the content unchanged if it is already in the
+        requested state, or None if neither pattern was found.
+    """
+    if to_velocity:
+        source, source_bytes = ORIGINAL_CODE, ORIGINAL_CODE_BYTES
+        target, target_bytes = MODIFIED_CODE, MODIFIED_CODE_BYTES
+    else:
+        source, source_bytes = MODIFIED_CODE, MODIFIED_CODE_BYTES
+        target, target_bytes = ORIGINAL_CODE, ORIGINAL_CODE_BYTES
+
+    if target_bytes in content:
+        print(f"[INFO] DllLock.cs already contains '{target}'")
+        return content
+    if source_bytes not in content:
+        print(f"[WARNING] Expected code not found in DllLock.cs")
+        print(f"  Looking for: {source}")
+        return None
+    print(f"[MODIFY] Changed '{source}' -> '{target}'")
+    return content.replace(source_bytes, target_bytes)
+
+
+def _apply_timestamp_comment(content: bytes) -> bytes:
+    """Add or update the timestamp comment line in DllLock.cs content."""
+    timestamp = datetime.now().isoformat(sep=" ", timespec="milliseconds")
+    comment_line = f"{COMMENT_PREFIX}{timestamp}"
+    comment_line_bytes = comment_line.encode("ascii")
+
+    new_content, replaced = _TIMESTAMP_LINE_RE.subn(
+        lambda _: comment_line_bytes, content, count=1
+    )
+    if replaced:
+        print(f"[MODIFY] Updated timestamp comment: {comment_line}")
+    else:
+        if not new_content.endswith(b"\n"):
+            new_content += b"\n"
+        new_content += comment_line_bytes + b"\n"
+        print(f"[MODIFY] Added timestamp comment: {comment_line}")
+    return new_content
+
+
 def modify_dll_lock_file(to_velocity: bool = True) -> bool:
     """
     Modify DllLock.cs to trigger Unity rebuild.
@@ -71,35 +260,17 @@ def modify_dll_lock_file(to_velocity: bool = True) -> bool:
     Returns:
         True if modification was successful, False otherwise.
     """
-    if not DLL_LOCK_CS_PATH.exists():
-        print(f"[ERROR] DllLock.cs not found at: {DLL_LOCK_CS_PATH}")
-        return False
-
     try:
-        content = DLL_LOCK_CS_PATH.read_text(encoding="utf-8")
-
-        if to_velocity:
-            if MODIFIED_CODE in content:
-                print(f"[INFO] DllLock.cs already contains '{MODIFIED_CODE}'")
-                return True
-            if ORIGINAL_CODE not in content:
-                print(f"[WARNING] Expected code not found in DllLock.cs")
-                print(f"  Looking for: {ORIGINAL_CODE}")
-                return False
-            new_content = content.replace(ORIGINAL_CODE, MODIFIED_CODE)
-            print(f"[MODIFY] Changed '{ORIGINAL_CODE}' -> '{MODIFIED_CODE}'")
-        else:
-            if ORIGINAL_CODE in content:
-                print(f"[INFO] DllLock.cs already contains '{ORIGINAL_CODE}'")
-                return True
-            if MODIFIED_CODE not in content:
-                print(f"[WARNING] Expected code not found in DllLock.cs")
-                print(f"  Looking for: {MODIFIED_CODE}")
-                return False
-            new_content = content.replace(MODIFIED_CODE, ORIGINAL_CODE)
-            print(f"[MODIFY] Changed '{MODIFIED_CODE}' -> '{ORIGINAL_CODE}'")
+        content = _read_dll_lock_file()
+        if content is None:
+            return False
+        new_content = _swap_velocity_code(content, to_velocity)
+        if new_content is None:
+            return False
+        if new_content is content:
+            return True
 
-        DLL_LOCK_CS_PATH.write_text(new_content, encoding="utf-8")
+        _write_file(DLL_LOCK_CS_PATH, new_content)
         print(f"[OK] DllLock.cs modified successfully")
         return True
 
@@ -115,33 +286,16 @@ def revert_dll_lock_file() -> bool:
 
 def add_timestamp_comment() -> bool:
     """Add or update a timestamp comment to trigger a rebuild without code changes."""
-    if not DLL_LOCK_CS_PATH.exists():
-        print(f"[ERROR] DllLock.cs not found at: {DLL_LOCK_CS_PATH}")
-        return False
-
     try:
-        content = DLL_LOCK_CS_PATH.read_text(encoding="utf-8")
-        timestamp = datetime.now().isoformat(sep=" ", timespec="seconds")
-        comment_line = f"{COMMENT_PREFIX}{timestamp}"
-
-        if COMMENT_PREFIX in content:
-            lines = content.splitlines()
-            updated_lines = [
-                comment_line if line.startswith(COMMENT_PREFIX) else line
-                for line in lines
-            ]
-            new_content = "\n".join(updated_lines)
-            if content.endswith("\n"):
-                new_content += "\n"
-            print(f"[MODIFY] Updated timestamp comment: {comment_line}")
-        else:
-            new_content = content
-            if not new_content.endswith("\n"):
-                new_content += "\n"
-            new_content += f"{comment_line}\n"
-            print(f"[MODIFY] Added timestamp comment: {comment_line}")
+        content = _read_dll_lock_file()
+        if content is None:
+            return False
+        new_content = _apply_timestamp_comment(content)
+        if new_content == content:
+            print("[SKIP] Timestamp unchanged, DllLock.cs not rewritten")
+            return True
 
-        DLL_LOCK_CS_PATH.write_text(new_content, encoding="utf-8")
+        _write_file(DLL_LOCK_CS_PATH, new_content)
         print("[OK] Timestamp comment updated successfully")
         return True
     except Exception as e:
@@ -149,10 +303,80 @@ def add_timestamp_comment() -> bool:
         return False
 
 
+def modify_and_timestamp_dll_lock_file(to_velocity: bool = True) -> bool:
+    """
+    Apply the modify and timestamp steps to DllLock.cs in a single write.
+
+    Unity sees one file change instead of two, so it only reacts once.
+    """
+    try:
+        content = _read_dll_lock_file()
+        if content is None:
+            return False
+        swapped_content = _swap_velocity_code(content, to_velocity)
+        if swapped_content is None:
+            return False
+        new_content = _apply_timestamp_comment(swapped_content)
+        if new_content == content:
+            print("[SKIP] DllLock.cs unchanged, not rewritten")
+            return True
+
+        _write_file(DLL_LOCK_CS_PATH, new_content)
+        print("[OK] DllLock.cs modified and timestamp comment updated successfully")
+        return True
+    except Exception as e:
+        print(f"[ERROR] Failed to modify DllLock.cs: {e}")
+        return False
+
+
+def _banner(title: str) -> None:
+    """Print a step title between two separator lines in a single write."""
+    sys.stdout.write(_BANNER_TEMPLATE.format(title))
+
+
+def _focus_window_by_title_prefix(prefix: str) -> bool:
+    """Focus the first visible top-level window whose title starts with prefix."""
+    user32 = ctypes.windll.user32
+    title_buffer = ctypes.create_unicode_buffer(_WINDOW_TITLE_BUFFER_SIZE)
+    match: list[tuple[int, str]] = []
+
+    # Unity appends platform/version info to the title, so an exact
+    # FindWindowW lookup misses it; a single EnumWindows pass with a prefix
+    # check still avoids pygetwindow's full window enumeration.
+    @ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+    def check_window(hwnd, _lparam):
+        if user32.IsWindowVisible(hwnd):
+            user32.GetWindowTextW(hwnd, title_buffer, _WINDOW_TITLE_BUFFER_SIZE)
+            if title_buffer.value.startswith(prefix):
+                match.append((hwnd, title_buffer.value))
+                return False
+        return True
+
+    user32.EnumWindows(check_window, 0)
+    if not match:
+        return False
+
+    hwnd, title = match[0]
+    if user32.IsIconic(hwnd):
+        user32.ShowWindow(hwnd, _SW_RESTORE)
+    # Windows may refuse to move focus; let the caller fall back to pygetwindow.
+    if not user32.SetForegroundWindow(hwnd):
+        print(f"[WARNING] Windows refused to focus: {title}")
+        return False
+    print(f"[OK] Focused Unity window: {title}")
+    return True
+
+
 def focus_unity_window() -> bool:
     """Focus the Unity Editor window."""
     try:
-        candidates = gw.getWindowsWithTitle("UnityCodeMcpServer - SampleScene")
+        if sys.platform == "win32" and _focus_window_by_title_prefix(
+            UNITY_WINDOW_TITLE
+        ):
+            return True
+
+        # Fall back to pygetwindow's substring match over all top-level windows.
+        candidates = gw.getWindowsWithTitle(UNITY_WINDOW_TITLE)
         if not candidates:
             print("[ERROR] No Unity windows found.")
             return False
@@ -168,30 +392,53 @@ def focus_unity_window() -> bool:
         return False
 
 
-async def execute_test_script(session: ClientSession) -> str:
+def _collect_text(result: CallToolResult, limit: int | None = None) -> str:
+    """
+    Join the text content of a tool result.
+
+    With a limit, only the first `limit` characters of the joined text are built,
+    followed by a note with the full length.
+    """
+    texts = [
+        text
+        for content in result.content
+        if (text := getattr(content, "text", None)) is not None
+    ]
+    if not texts:
+        return "(no output)"
+
+    total_chars = sum(map(len, texts)) + len(texts) - 1
+    if limit is None or total_chars <= limit:
+        return "\n".join(texts)
+
+    preview: list[str] = []
+    size = 0
+    for text in texts:
+        if size + len(text) >= limit:
+            preview.append(text[: limit - size])
+            break
+        preview.append(text)
+        size += len(text) + 1
+    return "\n".join(preview) + f"\n... (truncated, {total_chars} total chars)"
+
+
+async def execute_test_script(session: ClientSession, limit: int | None = None) -> str:
     """
     Execute a simple test script via MCP to trigger DLL loading.
 
     This causes Roslyn/ExecuteCSharpScriptInUnityEditor to load Assembly-CSharp.dll
     and other project assemblies into memory, potentially locking them.
-    """
-    script = 'Debug.Log("DLL Lock Test: Script executed successfully at " + System.DateTime.Now);'
 
+    Args:
+        session: Initialized MCP client session
+        limit: If set, truncate the returned output to this many characters
+    """
     print(f"\n[EXECUTE] Running script via MCP tool...")
-    print(f"  Script: {script}")
-
-    result = await session.call_tool(
-        "execute_csharp_script_in_unity_editor",
-        {"script": script},
-    )
+    print(f"  Script: {TEST_SCRIPT}")
 
-    # Extract text content from result
-    output_parts = []
-    for content in result.content:
-        if hasattr(content, "text"):
-            output_parts.append(content.text)
+    result = await session.call_tool(REQUIRED_TOOL, _TEST_SCRIPT_ARGUMENTS)
 
-    return "\n".join(output_parts) if output_parts else "(no output)"
+    return _collect_text(result, limit)
 
 
 async def execute_rebuild_script(session: ClientSession) -> str:
@@ -200,32 +447,32 @@ async def execute_rebuild_script(session: ClientSession) -> str:
 
     This increases the chance of overlapping compilation with tool execution.
     """
-    script = (
-        "UnityEditor.Compilation.CompilationPipeline.RequestScriptCompilation();"
-        "UnityEditor.AssetDatabase.Refresh();"
-        'Debug.Log("DLL Lock Test: Requested script compilation at " + System.DateTime.Now);'
-    )
-
     print(f"\n[EXECUTE] Forcing script compilation via MCP tool...")
-    print(f"  Script: {script}")
-
-    result = await session.call_tool(
-        "execute_csharp_script_in_unity_editor",
-        {"script": script},
-    )
+    print(f"  Script: {REBUILD_SCRIPT}")
 
-    output_parts = []
-    for content in result.content:
-        if hasattr(content, "text"):
-            output_parts.append(content.text)
+    result = await session.call_tool(REQUIRED_TOOL, _REBUILD_SCRIPT_ARGUMENTS)
 
-    return "\n".join(output_parts) if output_parts else "(no output)"
+    return _collect_text(result)
 
 
-async def list_available_tools(session: ClientSession) -> list[str]:
+async def list_available_tools(session: ClientSession) -> frozenset[str]:
     """List all available tools from the MCP server."""
     result = await session.list_tools()
-    return [tool.name for tool in result.tools]
+    return frozenset(tool.name for tool in result.tools)
+
+
+async def _ensure_required_tool(session: ClientSession, host: str, port: int) -> bool:
+    """Check that the server exposes REQUIRED_TOOL, listing tools once per process."""
+    if (host, port) in _VALIDATED_SERVERS:
+        return True
+
+    tools = await list_available_tools(session)
+    print(f"[INFO] Available tools: {len(tools)}")
+    if REQUIRED_TOOL not in tools:
+        print(f"[ERROR] Required tool '{REQUIRED_TOOL}' not found!")
+        return False
+    _VALIDATED_SERVERS.add((host, port))
+    return True
 
 
 async def reproduce_dll_lock(host: str, port: int, delay: float, revert: bool = False):
@@ -246,78 +493,56 @@ async def reproduce_dll_lock(host: str, port: int, delay: float, revert: bool =
     print("=" * 70)
     print()
 
-    server_params = get_server_params(host, port)
     print(f"[INFO] Using STDIO bridge at: {STDIO_BRIDGE_PATH}")
     print(f"[INFO] Connecting to Unity at {host}:{port}")
     print()
 
-    # Redirect stderr to devnull to suppress MCP library noise
-    devnull = open(os.devnull, "w")
-
     try:
-        async with stdio_client(server_params, errlog=devnull) as (read, write):
-            async with ClientSession(read, write) as session:
-                # Initialize the session
-                await session.initialize()
-                print("[OK] Connected to Unity MCP Server via STDIO bridge")
-
-                # List available tools to verify connection
-                tools = await list_available_tools(session)
-                print(f"[INFO] Available tools: {len(tools)}")
-                if "execute_csharp_script_in_unity_editor" not in tools:
-                    print(
-                        "[ERROR] Required tool 'execute_csharp_script_in_unity_editor' not found!"
-                    )
-                    return False
+        session = (await _get_session(host, port)).session
 
-                # Step 1: Modify DllLock.cs to trigger Unity rebuild
-                print("\n" + "-" * 70)
-                print("STEP 1: Modify DllLock.cs to trigger Unity rebuild")
-                print("-" * 70)
+        # List available tools to verify connection while the file is modified
+        tool_check = asyncio.create_task(_ensure_required_tool(session, host, port))
 
-                if revert:
-                    if not revert_dll_lock_file():
-                        print("[FAILED] Could not revert DllLock.cs")
-                        return False
-                else:
-                    if not modify_dll_lock_file(to_velocity=True):
-                        print("[FAILED] Could not modify DllLock.cs")
-                        return False
+        # Step 1: Modify DllLock.cs to trigger Unity rebuild
+        _banner("STEP 1: Modify DllLock.cs to trigger Unity rebuild")
 
-                # Step 2: Force script compilation via MCP tool
-                print("\n" + "-" * 70)
-                print("STEP 2: Force script compilation")
-                print("-" * 70)
+        if revert:
+            if not await asyncio.to_thread(revert_dll_lock_file):
+                tool_check.cancel()
+                print("[FAILED] Could not revert DllLock.cs")
+                return False
+        else:
+            if not await asyncio.to_thread(modify_dll_lock_file, to_velocity=True):
+                tool_check.cancel()
+                print("[FAILED] Could not modify DllLock.cs")
+                return False
 
-                await execute_rebuild_script(session)
+        if not await tool_check:
+            return False
 
-                # Step 3: Wait a short delay (Unity starts detecting file changes)
-                print(f"\n[WAIT] Waiting {delay}s for Unity to detect file change...")
-                await asyncio.sleep(delay)
+        # Step 2: Force script compilation via MCP tool
+        _banner("STEP 2: Force script compilation")
 
-                # Step 4: Execute MCP tool to load DLLs via Roslyn
-                print("\n" + "-" * 70)
-                print("STEP 3: Execute MCP tool (loads DLLs via Roslyn)")
-                print("-" * 70)
+        await execute_rebuild_script(session)
 
-                output = await execute_test_script(session)
+        # Step 3: Wait a short delay (Unity starts detecting file changes)
+        print(f"\n[WAIT] Waiting {delay}s for Unity to detect file change...")
+        await asyncio.sleep(delay)
 
-                # Step 4: Display results
-                print("\n" + "-" * 70)
-                print("RESULT")
-                print("-" * 70)
+        # Step 4: Execute MCP tool to load DLLs via Roslyn
+        _banner("STEP 3: Execute MCP tool (loads DLLs via Roslyn)")
 
-                # Print first 2000 chars to avoid flooding console
-                if len(output) > 2000:
-                    print(output[:2000])
-                    print(f"... (truncated, {len(output)} total chars)")
-                else:
-                    print(output)
+        # Keep only the first OUTPUT_PREVIEW_LIMIT chars to avoid flooding console
+        output = await execute_test_script(session, limit=OUTPUT_PREVIEW_LIMIT)
+
+        # Step 4: Display results
+        _banner("RESULT")
+        print(output)
 
-                print("\n" + "=" * 70)
-                print("NEXT STEPS")
-                print("=" * 70)
-                print("""
+        print("\n" + "=" * 70)
+        print("NEXT STEPS")
+        print("=" * 70)
+        print("""
 If the DLL lock issue was reproduced, you should see in Unity:
   - An API Update dialog (asking to update 'velocity' -> 'linearVelocity')
   - An error: "Library\\ScriptAssemblies\\Assembly-CSharp.dll: Copying the
@@ -328,16 +553,13 @@ To revert the file change, run:
   uv run reproduce_dll_lock --revert
 """)
 
-                return True
+        return True
 
     except Exception as e:
+        await _discard_session(host, port)
         print(f"\n[ERROR] Failed: {e}")
-        import traceback
-
         traceback.print_exc()
         return False
-    finally:
-        devnull.close()
 
 
 async def run_modify_only(revert: bool = False) -> bool:
@@ -357,53 +579,45 @@ async def run_timestamp_only() -> bool:
 async def run_rebuild_only(host: str, port: int) -> bool:
     """Only trigger a rebuild via MCP tool without modifying files."""
     print("Running rebuild only...")
-    server_params = get_server_params(host, port)
-    devnull = open(os.devnull, "w")
 
     try:
-        async with stdio_client(server_params, errlog=devnull) as (read, write):
-            async with ClientSession(read, write) as session:
-                await session.initialize()
-                print("[OK] Connected to Unity MCP Server")
-                await execute_rebuild_script(session)
-                return True
+        session = (await _get_session(host, port)).session
+        await execute_rebuild_script(session)
+        return True
     except Exception as e:
+        await _discard_session(host, port)
         print(f"[ERROR] Failed: {e}")
-        import traceback
-
         traceback.print_exc()
         return False
-    finally:
-        devnull.close()
 
 
 async def run_tool_only(host: str, port: int) -> bool:
     """Only execute MCP tool without modifying files."""
     print("Executing MCP tool without file modification...")
 
-    server_params = get_server_params(host, port)
-    devnull = open(os.devnull, "w")
-
     try:
-        async with stdio_client(server_params, errlog=devnull) as (read, write):
-            async with ClientSession(read, write) as session:
-                await session.initialize()
-                print("[OK] Connected to Unity MCP Server")
-
-                output = await execute_test_script(session)
-                print("\n" + "-" * 70)
-                print("OUTPUT")
-                print("-" * 70)
-                print(output)
-                return True
+        session = (await _get_session(host, port)).session
+
+        output = await execute_test_script(session)
+        _banner("OUTPUT")
+        print(output)
+        return True
     except Exception as e:
+        await _discard_session(host, port)
         print(f"[ERROR] Failed: {e}")
-        import traceback
-
         traceback.print_exc()
         return False
-    finally:
-        devnull.close()
+
+
+def _fuse_file_steps(steps: list[str]) -> list[str]:
+    """Merge adjacent modify and timestamp steps so DllLock.cs is written once."""
+    fused: list[str] = []
+    for step in steps:
+        if fused and {fused[-1], step} == {"modify", "timestamp"}:
+            fused[-1] = _FUSED_FILE_STEP
+        else:
+            fused.append(step)
+    return fused
 
 
 async def run_steps(
@@ -414,21 +628,19 @@ async def run_steps(
     revert: bool,
 ) -> bool:
     """Run selected steps in the requested order."""
-    valid_steps = {"modify", "rebuild", "wait", "execute", "timestamp", "focus"}
-    unknown = [step for step in steps if step not in valid_steps]
+    unknown = [step for step in steps if step not in _VALID_STEPS]
     if unknown:
         print(f"[ERROR] Unknown steps: {', '.join(unknown)}")
         print("Valid steps: modify,rebuild,wait,execute,timestamp")
         return False
 
-    requires_mcp = any(step in {"rebuild", "execute"} for step in steps)
+    requires_mcp = not _MCP_STEPS.isdisjoint(steps)
+    steps = _fuse_file_steps(steps)
 
     if not requires_mcp:
         for step in steps:
             if step == "modify":
-                print("\n" + "-" * 70)
-                print("STEP: Modify DllLock.cs")
-                print("-" * 70)
+                _banner("STEP: Modify DllLock.cs")
                 if revert:
                     if not revert_dll_lock_file():
                         print("[FAILED] Could not revert DllLock.cs")
@@ -438,193 +650,197 @@ async def run_steps(
                         print("[FAILED] Could not modify DllLock.cs")
                         return False
 
+            elif step == _FUSED_FILE_STEP:
+                _banner("STEP: Modify DllLock.cs and update timestamp comment")
+                if not modify_and_timestamp_dll_lock_file(to_velocity=not revert):
+                    print("[FAILED] Could not modify DllLock.cs")
+                    return False
+
             elif step == "timestamp":
-                print("\n" + "-" * 70)
-                print("STEP: Update timestamp comment")
-                print("-" * 70)
+                _banner("STEP: Update timestamp comment")
                 if not add_timestamp_comment():
                     print("[FAILED] Could not update timestamp comment")
                     return False
 
             elif step == "focus":
-                print("\n" + "-" * 70)
-                print("STEP: Focus Unity window")
-                print("-" * 70)
+                _banner("STEP: Focus Unity window")
                 if not focus_unity_window():
                     print("[FAILED] Could not focus Unity window")
                     return False
 
             elif step == "wait":
-                print("\n" + "-" * 70)
-                print("STEP: Wait")
-                print("-" * 70)
+                _banner("STEP: Wait")
                 print(f"[WAIT] Waiting {delay}s...")
                 await asyncio.sleep(delay)
 
         return True
 
-    server_params = get_server_params(host, port)
-    devnull = open(os.devnull, "w")
-
     try:
-        async with stdio_client(server_params, errlog=devnull) as (read, write):
-            async with ClientSession(read, write) as session:
-                await session.initialize()
-                print("[OK] Connected to Unity MCP Server via STDIO bridge")
-
-                tools = await list_available_tools(session)
-                if "execute_csharp_script_in_unity_editor" not in tools:
-                    print(
-                        "[ERROR] Required tool 'execute_csharp_script_in_unity_editor' not found!"
-                    )
+        session = (await _get_session(host, port)).session
+
+        # Check for the required tool in the background; file steps (run in a
+        # worker thread) and waits proceed meanwhile, and the first MCP step
+        # awaits it.
+        tool_check = asyncio.create_task(_ensure_required_tool(session, host, port))
+
+        try:
+            for step in steps:
+                if step in _MCP_STEPS and not await tool_check:
                     return False
 
-                for step in steps:
-                    if step == "modify":
-                        print("\n" + "-" * 70)
-                        print("STEP: Modify DllLock.cs")
-                        print("-" * 70)
-                        if revert:
-                            if not revert_dll_lock_file():
-                                print("[FAILED] Could not revert DllLock.cs")
-                                return False
-                        else:
-                            if not modify_dll_lock_file(to_velocity=True):
-                                print("[FAILED] Could not modify DllLock.cs")
-                                return False
-
-                    elif step == "rebuild":
-                        print("\n" + "-" * 70)
-                        print("STEP: Force script compilation")
-                        print("-" * 70)
-                        await execute_rebuild_script(session)
-
-                    elif step == "timestamp":
-                        print("\n" + "-" * 70)
-                        print("STEP: Update timestamp comment")
-                        print("-" * 70)
-                        if not add_timestamp_comment():
-                            print("[FAILED] Could not update timestamp comment")
+                if step == "modify":
+                    _banner("STEP: Modify DllLock.cs")
+                    if revert:
+                        if not await asyncio.to_thread(revert_dll_lock_file):
+                            print("[FAILED] Could not revert DllLock.cs")
                             return False
-
-                    elif step == "focus":
-                        print("\n" + "-" * 70)
-                        print("STEP: Focus Unity window")
-                        print("-" * 70)
-                        if not focus_unity_window():
-                            print("[FAILED] Could not focus Unity window")
+                    else:
+                        if not await asyncio.to_thread(
+                            modify_dll_lock_file, to_velocity=True
+                        ):
+                            print("[FAILED] Could not modify DllLock.cs")
                             return False
 
-                    elif step == "wait":
-                        print("\n" + "-" * 70)
-                        print("STEP: Wait")
-                        print("-" * 70)
-                        print(f"[WAIT] Waiting {delay}s...")
-                        await asyncio.sleep(delay)
-
-                    elif step == "execute":
-                        print("\n" + "-" * 70)
-                        print("STEP: Execute MCP tool (loads DLLs via Roslyn)")
-                        print("-" * 70)
-                        output = await execute_test_script(session)
-                        print("\n" + "-" * 70)
-                        print("RESULT")
-                        print("-" * 70)
-                        if len(output) > 2000:
-                            print(output[:2000])
-                            print(f"... (truncated, {len(output)} total chars)")
-                        else:
-                            print(output)
-
-                return True
-    except Exception as e:
-        print(f"\n[ERROR] Failed: {e}")
-        import traceback
+                elif step == _FUSED_FILE_STEP:
+                    _banner("STEP: Modify DllLock.cs and update timestamp comment")
+                    if not await asyncio.to_thread(
+                        modify_and_timestamp_dll_lock_file, to_velocity=not revert
+                    ):
+                        print("[FAILED] Could not modify DllLock.cs")
+                        return False
 
-        traceback.print_exc()
-        return False
-    finally:
-        devnull.close()
-    unknown = [step for step in steps if step not in valid_steps]
-    if unknown:
-        print(f"[ERROR] Unknown steps: {', '.join(unknown)}")
-        print("Valid steps: modify,rebuild,wait,execute")
-        return False
+                elif step == "rebuild":
+                    _banner("STEP: Force script compilation")
+                    await execute_rebuild_script(session)
 
-    server_params = get_server_params(host, port)
-    devnull = open(os.devnull, "w")
+                elif step == "timestamp":
+                    _banner("STEP: Update timestamp comment")
+                    if not await asyncio.to_thread(add_timestamp_comment):
+                        print("[FAILED] Could not update timestamp comment")
+                        return False
 
-    try:
-        async with stdio_client(server_params, errlog=devnull) as (read, write):
-            async with ClientSession(read, write) as session:
-                await session.initialize()
-                print("[OK] Connected to Unity MCP Server via STDIO bridge")
-
-                tools = await list_available_tools(session)
-                if "execute_csharp_script_in_unity_editor" not in tools:
-                    print(
-                        "[ERROR] Required tool 'execute_csharp_script_in_unity_editor' not found!"
-                    )
-                    return False
+                elif step == "focus":
+                    _banner("STEP: Focus Unity window")
+                    if not focus_unity_window():
+                        print("[FAILED] Could not focus Unity window")
+                        return False
 
-                for step in steps:
-                    if step == "modify":
-                        print("\n" + "-" * 70)
-                        print("STEP: Modify DllLock.cs")
-                        print("-" * 70)
-                        if revert:
-                            if not revert_dll_lock_file():
-                                print("[FAILED] Could not revert DllLock.cs")
-                                return False
-                        else:
-                            if not modify_dll_lock_file(to_velocity=True):
-                                print("[FAILED] Could not modify DllLock.cs")
-                                return False
-
-                    elif step == "rebuild":
-                        print("\n" + "-" * 70)
-                        print("STEP: Force script compilation")
-                        print("-" * 70)
-                        await execute_rebuild_script(session)
-
-                    elif step == "timestamp":
-                        print("\n" + "-" * 70)
-                        print("STEP: Update timestamp comment")
-                        print("-" * 70)
-                        if not add_timestamp_comment():
-                            print("[FAILED] Could not update timestamp comment")
-                            return False
+                elif step == "wait":
+                    _banner("STEP: Wait")
+                    print(f"[WAIT] Waiting {delay}s...")
+                    await asyncio.sleep(delay)
+
+                elif step == "execute":
+                    _banner("STEP: Execute MCP tool (loads DLLs via Roslyn)")
+                    output = await execute_test_script(
+                        session, limit=OUTPUT_PREVIEW_LIMIT
+                    )
+                    _banner("RESULT")
+                    print(output)
+        finally:
+            tool_check.cancel()
+            if tool_check.done() and not tool_check.cancelled():
+                # Mark a failed check as retrieved so asyncio does not warn.
+                tool_check.exception()
 
-                    elif step == "wait":
-                        print("\n" + "-" * 70)
-                        print("STEP: Wait")
-                        print("-" * 70)
-                        print(f"[WAIT] Waiting {delay}s...")
-                        await asyncio.sleep(delay)
-
-                    elif step == "execute":
-                        print("\n" + "-" * 70)
-                        print("STEP: Execute MCP tool (loads DLLs via Roslyn)")
-                        print("-" * 70)
-                        output = await execute_test_script(session)
-                        print("\n" + "-" * 70)
-                        print("RESULT")
-                        print("-" * 70)
-                        if len(output) > 2000:
-                            print(output[:2000])
-                            print(f"... (truncated, {len(output)} total chars)")
-                        else:
-                            print(output)
-
-                return True
+        return True
     except Exception as e:
+        await _discard_session(host, port)
         print(f"\n[ERROR] Failed: {e}")
-        import traceback
-
         traceback.print_exc()
         return False
-    finally:
-        devnull.close()
+
+
+class ScriptSelfTests(unittest.TestCase):
+    def test_fuse_file_steps_merges_adjacent_pairs_in_either_order(self) -> None:
+        self.assertEqual(
+            _fuse_file_steps(["modify", "timestamp", "rebuild", "timestamp", "modify"]),
+            [_FUSED_FILE_STEP, "rebuild", _FUSED_FILE_STEP],
+        )
+        self.assertEqual(
+            _fuse_file_steps(["modify", "modify", "timestamp", "timestamp"]),
+            ["modify", _FUSED_FILE_STEP, "timestamp"],
+        )
+
+    def test_fuse_file_steps_keeps_separated_steps(self) -> None:
+        steps = ["modify", "wait", "timestamp", "execute", "modify"]
+
+        self.assertEqual(_fuse_file_steps(steps), steps)
+
+    def test_swap_velocity_code_round_trips_every_occurrence(self) -> None:
+        content = b"a\r\n" + ORIGINAL_CODE_BYTES + b"\r\n" + ORIGINAL_CODE_BYTES
+
+        modified = _swap_velocity_code(content, to_velocity=True)
+
+        self.assertEqual(
+            modified,
+            b"a\r\n" + MODIFIED_CODE_BYTES + b"\r\n" + MODIFIED_CODE_BYTES,
+        )
+        self.assertEqual(_swap_velocity_code(modified, to_velocity=False), content)
+
+    def test_swap_velocity_code_reports_current_or_missing_state(self) -> None:
+        content = b"class A {}\n" + MODIFIED_CODE_BYTES
+
+        self.assertIs(_swap_velocity_code(content, to_velocity=True), content)
+        self.assertIsNone(_swap_velocity_code(b"class A {}\n", to_velocity=True))
+
+    def test_apply_timestamp_comment_updates_first_line_and_keeps_crlf(self) -> None:
+        content = (
+            b"class A {}\r\n"
+            + COMMENT_PREFIX_BYTES
+            + b"old\r\n"
+            + COMMENT_PREFIX_BYTES
+            + b"older\r\n"
+        )
+
+        updated = _apply_timestamp_comment(content)
+
+        lines = updated.split(b"\r\n")
+        self.assertEqual(len(lines), 4)
+        self.assertEqual(lines[0], b"class A {}")
+        self.assertTrue(lines[1].startswith(COMMENT_PREFIX_BYTES))
+        self.assertNotEqual(lines[1], COMMENT_PREFIX_BYTES + b"old")
+        self.assertEqual(lines[2:], [COMMENT_PREFIX_BYTES + b"older", b""])
+
+    def test_apply_timestamp_comment_appends_when_no_line_exists(self) -> None:
+        for content in (b"class A {}", b"class A {}\n"):
+            updated = _apply_timestamp_comment(content)
+
+            self.assertTrue(updated.startswith(b"class A {}\n" + COMMENT_PREFIX_BYTES))
+            self.assertTrue(updated.endswith(b"\n"))
+            self.assertEqual(updated.count(b"\n"), 2)
+
+    def test_collect_text_truncates_just_over_the_limit_at_a_block_boundary(
+        self,
+    ) -> None:
+        result = CallToolResult(
+            content=[
+                TextContent(type="text", text="a" * 5),
+                TextContent(type="text", text="b" * 5),
+            ]
+        )
+        joined = "a" * 5 + "\n" + "b" * 5
+
+        self.assertEqual(_collect_text(result, limit=11), joined)
+        for limit in (5, 6, 10):
+            self.assertEqual(
+                _collect_text(result, limit=limit),
+                f"{joined[:limit]}\n... (truncated, 11 total chars)",
+            )
+
+    def test_collect_text_reports_missing_text_blocks(self) -> None:
+        image = ImageContent(type="image", data="", mimeType="image/png")
+
+        self.assertEqual(_collect_text(CallToolResult(content=[])), "(no output)")
+        self.assertEqual(
+            _collect_text(CallToolResult(content=[image]), limit=5), "(no output)"
+        )
+
+
+def run_self_tests() -> int:
+    suite = unittest.defaultTestLoader.loadTestsFromTestCase(ScriptSelfTests)
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+    return 0 if result.wasSuccessful() else 1
 
 
 async def main_async():
@@ -682,26 +898,34 @@ async def main_async():
         default="modify,rebuild,wait,execute",
         help="Comma-separated steps to run in order: modify,rebuild,wait,execute,timestamp,focus",
     )
+    parser.add_argument(
+        "--self-test", action="store_true", help="Run the built-in self-tests and exit"
+    )
 
     args = parser.parse_args()
+    if args.self_test:
+        return run_self_tests()
 
-    if args.modify_only:
-        await run_modify_only(args.revert)
-    elif args.comment_timestamp:
-        await run_timestamp_only()
-    elif args.rebuild_only:
-        await run_rebuild_only(args.host, args.port)
-    elif args.no_modify:
-        await run_tool_only(args.host, args.port)
-    else:
-        steps = [step.strip() for step in args.steps.split(",") if step.strip()]
-        await run_steps(steps, args.host, args.port, args.delay, args.revert)
+    try:
+        if args.modify_only:
+            await run_modify_only(args.revert)
+        elif args.comment_timestamp:
+            await run_timestamp_only()
+        elif args.rebuild_only:
+            await run_rebuild_only(args.host, args.port)
+        elif args.no_modify:
+            await run_tool_only(args.host, args.port)
+        else:
+            steps = [step.strip() for step in args.steps.split(",") if step.strip()]
+            await run_steps(steps, args.host, args.port, args.delay, args.revert)
+    finally:
+        await close_sessions()
 
 
 def main():
     """Main entry point."""
-    asyncio.run(main_async())
+    return asyncio.run(main_async())
 
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(main())